@@ -6,6 +6,7 @@ This package provides tools for querying and analyzing ocean data from ARGO data
 
 from .ocean_data_query import (
     OceanDataQuery,
+    QueryResult,
     get_sample_data,
     get_data_count,
     query_by_location,
@@ -19,6 +20,7 @@ __author__ = "SIH'25 Team"
 
 __all__ = [
     'OceanDataQuery',
+    'QueryResult',
     'get_sample_data',
     'get_data_count',
     'query_by_location',
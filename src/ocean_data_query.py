@@ -5,30 +5,68 @@ This module provides reusable functions to query ocean data efficiently.
 Includes geographic filtering, temporal filtering, and data aggregation functions.
 """
 
-import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from dataclasses import dataclass
 from datetime import datetime, date
 from typing import Dict, List, Optional, Union, Tuple, Any
 import json
+import re
 import sys
 import os
 
-# Add config to path
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config'))
-
 try:
-    from database import get_database_url
+    from config.database import get_database_url, get_engine
 except ImportError:
-    print("Warning: Could not import database configuration")
-    
+    # Fall back for direct script runs where the project root is not on
+    # sys.path yet (e.g. python src/ocean_data_query.py from elsewhere)
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        from config.database import get_database_url, get_engine
+    except ImportError:
+        print("Warning: Could not import database configuration")
+
 
 class OceanDataQueryError(Exception):
     """Custom exception for ocean data query errors"""
     pass
 
 
+# Valid SQL identifier - keeps the f-string table substitution safe and
+# the precompiled statements stable
+_TABLE_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """
+    Result of a query_* call.
+
+    Slotted attributes instead of a per-result dict: fixed-offset
+    attribute access, no instance __dict__ allocation, and typos raise
+    AttributeError instead of silently creating keys. Use as_dict()
+    where a JSON-serializable mapping is needed.
+    """
+    success: bool
+    message: str
+    data: Any
+    timestamp: str
+    metadata: Optional[Dict] = None
+
+    def as_dict(self) -> Dict:
+        """Return the JSON-ready dict form of this result"""
+        response = {
+            "success": self.success,
+            "timestamp": self.timestamp,
+            "message": self.message,
+            "data": self.data,
+        }
+        if self.metadata is not None:
+            response["metadata"] = self.metadata
+        return response
+
+
 class OceanDataQuery:
     """
     Class to handle all ocean data queries with proper error handling,
@@ -42,20 +80,82 @@ class OceanDataQuery:
         Args:
             table_name (str): Name of the database table containing ocean data
         """
+        if not _TABLE_NAME_PATTERN.match(table_name):
+            raise OceanDataQueryError(f"Invalid table name: {table_name}")
         self.table_name = table_name
         self.engine = None
         self._connect()
+        self._statements = self._build_statements()
+
+    def _build_statements(self) -> Dict[str, Any]:
+        """
+        Build the reusable SQL statements once per instance.
+
+        Reusing the same text() objects lets SQLAlchemy serve every call
+        from its compiled-statement cache instead of re-parsing the SQL
+        string each time.
+
+        Returns:
+            Dict[str, Any]: Named text() clauses keyed by query type
+        """
+        table = self.table_name
+        return {
+            "sample": text(f"""
+            SELECT * FROM {table}
+            ORDER BY datetime
+            LIMIT :limit
+            """),
+            "count": text(f"SELECT COUNT(*) as total_records FROM {table}"),
+            "by_location": text(f"""
+            SELECT * FROM {table}
+            WHERE lat BETWEEN :min_lat AND :max_lat
+            AND lon BETWEEN :min_lon AND :max_lon
+            ORDER BY datetime
+            LIMIT :limit OFFSET :offset
+            """),
+            "by_date_range": text(f"""
+            SELECT * FROM {table}
+            WHERE datetime >= :start_date AND datetime <= :end_date
+            ORDER BY datetime
+            LIMIT :limit
+            """),
+            "summary": text(f"""
+            SELECT
+                (SELECT json_build_object(
+                    'total_records', COUNT(*),
+                    'min_latitude', MIN(lat),
+                    'max_latitude', MAX(lat),
+                    'min_longitude', MIN(lon),
+                    'max_longitude', MAX(lon),
+                    'earliest_date', MIN(datetime),
+                    'latest_date', MAX(datetime),
+                    'avg_mixed_layer_depth', AVG(mld),
+                    'min_mixed_layer_depth', MIN(mld),
+                    'max_mixed_layer_depth', MAX(mld),
+                    'unique_dates', COUNT(DISTINCT datetime)
+                ) FROM {table} WHERE mld IS NOT NULL) AS summary,
+                (SELECT json_agg(row_to_json(t))
+                 FROM (
+                    SELECT
+                        date_trunc('month', datetime::timestamp) as month,
+                        COUNT(*) as record_count
+                    FROM {table}
+                    GROUP BY 1
+                    ORDER BY 1
+                    LIMIT 12
+                 ) t) AS temporal
+            """),
+        }
     
     def _connect(self):
         """Establish database connection"""
         try:
-            database_url = get_database_url()
-            self.engine = create_engine(database_url)
-            
-            # Test connection
-            with self.engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                
+            # Shared pooled engine - cached across all instances. No
+            # probe query here: pool_pre_ping already validates
+            # connections on checkout, and a dead database surfaces at
+            # the first real query anyway.
+            self.engine = get_engine()
+
         except Exception as e:
             raise OceanDataQueryError(f"Failed to connect to database: {e}")
     
@@ -86,7 +186,37 @@ class OceanDataQuery:
         
         return True
     
-    def _validate_dates(self, start_date: Union[str, date], 
+    def validate_location(self, lat_range: Tuple[float, float],
+                          lon_range: Tuple[float, float]) -> QueryResult:
+        """
+        Validate coordinate ranges without touching the database.
+
+        The validation is purely client-side, so callers probing bad
+        input (e.g. error-path tests) can use this instead of
+        query_by_location and skip the connection checkout entirely.
+
+        Args:
+            lat_range: Tuple of (min_latitude, max_latitude)
+            lon_range: Tuple of (min_longitude, max_longitude)
+
+        Returns:
+            QueryResult: The same error response query_by_location would
+                return for invalid input; a success response otherwise
+        """
+        try:
+            self._validate_coordinates(lat_range, lon_range)
+            return self._format_response(
+                data=[],
+                message="Coordinates are valid"
+            )
+        except Exception as e:
+            return self._format_response(
+                data=[],
+                success=False,
+                message=f"Error querying by location: {str(e)}"
+            )
+
+    def _validate_dates(self, start_date: Union[str, date],
                        end_date: Union[str, date]) -> Tuple[str, str]:
         """
         Validate and convert dates to string format.
@@ -102,55 +232,64 @@ class OceanDataQuery:
             OceanDataQueryError: If dates are invalid
         """
         try:
-            if isinstance(start_date, str):
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                start_str = start_date
-            else:
-                start_dt = datetime.combine(start_date, datetime.min.time())
-                start_str = start_date.strftime("%Y-%m-%d")
-            
-            if isinstance(end_date, str):
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                end_str = end_date
-            else:
-                end_dt = datetime.combine(end_date, datetime.min.time())
-                end_str = end_date.strftime("%Y-%m-%d")
-            
-            if start_dt > end_dt:
+            # Normalize to YYYY-MM-DD strings, then parse once with the
+            # C-implemented date.fromisoformat (much faster than
+            # strptime) and compare the date objects directly
+            start_str = start_date if isinstance(start_date, str) else start_date.isoformat()[:10]
+            end_str = end_date if isinstance(end_date, str) else end_date.isoformat()[:10]
+
+            if date.fromisoformat(start_str) > date.fromisoformat(end_str):
                 raise OceanDataQueryError(f"Start date {start_str} must be before end date {end_str}")
-            
+
             return start_str, end_str
-            
+
         except ValueError as e:
             raise OceanDataQueryError(f"Invalid date format: {e}")
     
-    def _format_response(self, data: Any, success: bool = True, 
-                        message: str = "", metadata: Dict = None) -> Dict:
+    def _fetch_records(self, stmt, params: Dict = None) -> Tuple[List[Dict], List[str]]:
         """
-        Format response in consistent JSON-ready format.
-        
+        Run a SELECT and return JSON-ready row dicts plus column names.
+
+        Iterates the result via .mappings(), which yields native Python
+        values (None for SQL NULL), so no DataFrame round-trip or NaN
+        normalization pass is needed.
+
+        Args:
+            stmt: Precompiled text() clause with :name placeholders
+            params: Bind parameter values
+
+        Returns:
+            Tuple[List[Dict], List[str]]: Row dicts and column names
+        """
+        with self.engine.connect() as conn:
+            result = conn.execute(stmt, params or {})
+            columns = list(result.keys())
+            records = [dict(row) for row in result.mappings()]
+        return records, columns
+
+    def _format_response(self, data: Any, success: bool = True,
+                        message: str = "", metadata: Dict = None) -> QueryResult:
+        """
+        Format response as a slotted QueryResult.
+
         Args:
             data: The actual data to return
             success: Whether the operation was successful
             message: Optional message
             metadata: Optional metadata about the query
-            
+
         Returns:
-            Dict: Formatted response
+            QueryResult: Formatted response
         """
-        response = {
-            "success": success,
-            "timestamp": datetime.now().isoformat(),
-            "message": message,
-            "data": data
-        }
-        
-        if metadata:
-            response["metadata"] = metadata
-            
-        return response
+        return QueryResult(
+            success=success,
+            timestamp=datetime.now().isoformat(),
+            message=message,
+            data=data,
+            metadata=metadata,
+        )
     
-    def get_sample_data(self, limit: int = 5) -> Dict:
+    def get_sample_data(self, limit: int = 5) -> QueryResult:
         """
         Get sample records from the ocean data.
         
@@ -158,35 +297,21 @@ class OceanDataQuery:
             limit (int): Number of sample records to return (default: 5)
             
         Returns:
-            Dict: JSON-ready response with sample data
+            QueryResult: Response with sample data
         """
         try:
             if limit <= 0 or limit > 1000:
                 raise OceanDataQueryError("Limit must be between 1 and 1000")
-            
-            query = f"""
-            SELECT * FROM {self.table_name}
-            ORDER BY datetime
-            LIMIT :limit
-            """
-            
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn, params={"limit": limit})
-            
-            # Convert DataFrame to list of dictionaries for JSON serialization
-            records = df.to_dict('records')
-            
-            # Convert any NaN values to None for JSON compatibility
-            for record in records:
-                for key, value in record.items():
-                    if pd.isna(value):
-                        record[key] = None
-            
+
+            records, columns = self._fetch_records(
+                self._statements["sample"], params={"limit": limit}
+            )
+
             metadata = {
                 "query_type": "sample_data",
                 "limit": limit,
                 "returned_records": len(records),
-                "columns": list(df.columns) if not df.empty else []
+                "columns": columns if records else []
             }
             
             return self._format_response(
@@ -202,18 +327,65 @@ class OceanDataQuery:
                 message=f"Error retrieving sample data: {str(e)}"
             )
     
-    def get_data_count(self) -> Dict:
+    def get_sample_data_columnar(self, limit: int = 5) -> QueryResult:
+        """
+        Get sample records in columnar (one array per column) form.
+
+        Unlike get_sample_data, which builds one dict per row, this
+        returns a NumPy array per column. For large limits that avoids
+        allocating thousands of small row dicts, at the cost of the
+        response data not being JSON-ready.
+
+        Args:
+            limit (int): Number of sample records to return (default: 5)
+
+        Returns:
+            QueryResult: Response whose data maps column names to NumPy arrays
+        """
+        try:
+            if limit <= 0 or limit > 1000:
+                raise OceanDataQueryError("Limit must be between 1 and 1000")
+
+            with self.engine.connect() as conn:
+                result = conn.execute(self._statements["sample"], {"limit": limit})
+                columns = list(result.keys())
+                rows = result.fetchall()
+
+            arrays = {
+                column: np.array(values)
+                for column, values in zip(columns, zip(*rows))
+            } if rows else {column: np.array([]) for column in columns}
+
+            metadata = {
+                "query_type": "sample_data_columnar",
+                "limit": limit,
+                "returned_records": len(rows),
+                "columns": columns
+            }
+
+            return self._format_response(
+                data=arrays,
+                message=f"Retrieved {len(rows)} sample records (columnar)",
+                metadata=metadata
+            )
+
+        except Exception as e:
+            return self._format_response(
+                data={},
+                success=False,
+                message=f"Error retrieving columnar sample data: {str(e)}"
+            )
+
+    def get_data_count(self) -> QueryResult:
         """
         Get total record count from the ocean data table.
         
         Returns:
-            Dict: JSON-ready response with record count
+            QueryResult: Response with record count
         """
         try:
-            query = f"SELECT COUNT(*) as total_records FROM {self.table_name}"
-            
             with self.engine.connect() as conn:
-                result = conn.execute(text(query))
+                result = conn.execute(self._statements["count"])
                 count = result.fetchone()[0]
             
             metadata = {
@@ -234,55 +406,49 @@ class OceanDataQuery:
                 message=f"Error counting records: {str(e)}"
             )
     
-    def query_by_location(self, lat_range: Tuple[float, float], 
-                         lon_range: Tuple[float, float], limit: int = 100) -> Dict:
+    def query_by_location(self, lat_range: Tuple[float, float],
+                         lon_range: Tuple[float, float], limit: int = 100,
+                         offset: int = 0) -> QueryResult:
         """
         Query ocean data by geographic location (latitude and longitude ranges).
-        
+
         Args:
             lat_range: Tuple of (min_latitude, max_latitude)
             lon_range: Tuple of (min_longitude, max_longitude)
             limit: Maximum number of records to return
-            
+            offset: Number of matching records to skip, for paging
+
         Returns:
-            Dict: JSON-ready response with filtered data
+            QueryResult: Response with filtered data
         """
         try:
             # Validate coordinates
             self._validate_coordinates(lat_range, lon_range)
-            
+
             if limit <= 0 or limit > 10000:
                 raise OceanDataQueryError("Limit must be between 1 and 10,000")
-            
+
+            if offset < 0:
+                raise OceanDataQueryError("Offset must not be negative")
+
             min_lat, max_lat = lat_range
             min_lon, max_lon = lon_range
-            
-            query = f"""
-            SELECT * FROM {self.table_name}
-            WHERE lat BETWEEN :min_lat AND :max_lat
-            AND lon BETWEEN :min_lon AND :max_lon
-            ORDER BY datetime
-            LIMIT :limit
-            """
-            
+
             params = {
                 "min_lat": min_lat,
                 "max_lat": max_lat,
                 "min_lon": min_lon,
                 "max_lon": max_lon,
-                "limit": limit
+                "limit": limit,
+                "offset": offset
             }
-            
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn, params=params)
-            
-            # Convert to JSON-ready format
-            records = df.to_dict('records')
-            for record in records:
-                for key, value in record.items():
-                    if pd.isna(value):
-                        record[key] = None
-            
+
+            # The range predicates are served by the BRIN index on
+            # (lat, lon) created at load time
+            records, columns = self._fetch_records(
+                self._statements["by_location"], params=params
+            )
+
             metadata = {
                 "query_type": "location_filter",
                 "filters": {
@@ -291,7 +457,7 @@ class OceanDataQuery:
                 },
                 "limit": limit,
                 "returned_records": len(records),
-                "columns": list(df.columns) if not df.empty else []
+                "columns": columns if records else []
             }
             
             return self._format_response(
@@ -308,7 +474,7 @@ class OceanDataQuery:
             )
     
     def query_by_date_range(self, start_date: Union[str, date], 
-                           end_date: Union[str, date], limit: int = 100) -> Dict:
+                           end_date: Union[str, date], limit: int = 100) -> QueryResult:
         """
         Query ocean data by date range.
         
@@ -318,7 +484,7 @@ class OceanDataQuery:
             limit: Maximum number of records to return
             
         Returns:
-            Dict: JSON-ready response with filtered data
+            QueryResult: Response with filtered data
         """
         try:
             # Validate dates
@@ -326,30 +492,17 @@ class OceanDataQuery:
             
             if limit <= 0 or limit > 10000:
                 raise OceanDataQueryError("Limit must be between 1 and 10,000")
-            
-            query = f"""
-            SELECT * FROM {self.table_name}
-            WHERE datetime >= :start_date AND datetime <= :end_date
-            ORDER BY datetime
-            LIMIT :limit
-            """
-            
+
             params = {
                 "start_date": start_str,
                 "end_date": end_str,
                 "limit": limit
             }
-            
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn, params=params)
-            
-            # Convert to JSON-ready format
-            records = df.to_dict('records')
-            for record in records:
-                for key, value in record.items():
-                    if pd.isna(value):
-                        record[key] = None
-            
+
+            records, columns = self._fetch_records(
+                self._statements["by_date_range"], params=params
+            )
+
             metadata = {
                 "query_type": "date_range_filter",
                 "filters": {
@@ -358,7 +511,7 @@ class OceanDataQuery:
                 },
                 "limit": limit,
                 "returned_records": len(records),
-                "columns": list(df.columns) if not df.empty else []
+                "columns": columns if records else []
             }
             
             return self._format_response(
@@ -374,75 +527,61 @@ class OceanDataQuery:
                 message=f"Error querying by date range: {str(e)}"
             )
     
-    def get_data_summary(self) -> Dict:
+    def get_data_summary(self) -> QueryResult:
         """
         Get comprehensive dataset overview statistics.
         
         Returns:
-            Dict: JSON-ready response with dataset statistics
+            QueryResult: Response with dataset statistics
         """
         try:
-            # Get basic statistics
-            summary_query = f"""
-            SELECT 
-                COUNT(*) as total_records,
-                MIN(lat) as min_latitude,
-                MAX(lat) as max_latitude,
-                MIN(lon) as min_longitude,
-                MAX(lon) as max_longitude,
-                MIN(datetime) as earliest_date,
-                MAX(datetime) as latest_date,
-                AVG(mld) as avg_mixed_layer_depth,
-                MIN(mld) as min_mixed_layer_depth,
-                MAX(mld) as max_mixed_layer_depth,
-                COUNT(DISTINCT datetime) as unique_dates
-            FROM {self.table_name}
-            WHERE mld IS NOT NULL
-            """
-            
+            # Single round-trip: one statement carries both the
+            # aggregate statistics (over rows with mld present) and the
+            # temporal distribution, which deliberately counts every
+            # row per month regardless of mld
             with self.engine.connect() as conn:
-                summary_result = conn.execute(text(summary_query))
-                summary_row = summary_result.fetchone()
-                
-                # Get record count per month/year for temporal distribution
-                temporal_query = f"""
-                SELECT 
-                    EXTRACT(YEAR FROM datetime::date) as year,
-                    EXTRACT(MONTH FROM datetime::date) as month,
-                    COUNT(*) as record_count
-                FROM {self.table_name}
-                GROUP BY EXTRACT(YEAR FROM datetime::date), EXTRACT(MONTH FROM datetime::date)
-                ORDER BY year, month
-                LIMIT 12
-                """
-                temporal_df = pd.read_sql(temporal_query, conn)
-            
+                row = conn.execute(self._statements["summary"]).fetchone()
+
+            stats = row[0] or {}
+
+            # The server groups on a single date_trunc('month', ...)
+            # bucket (cheaper than two EXTRACTs, and indexable); split
+            # it back into year/month here for the response
+            temporal_records = []
+            for rec in (row[1] or []):
+                bucket = datetime.fromisoformat(rec["month"])
+                temporal_records.append({
+                    "year": bucket.year,
+                    "month": bucket.month,
+                    "record_count": rec["record_count"]
+                })
+
             # Format summary data
             summary_data = {
                 "dataset_overview": {
-                    "total_records": int(summary_row[0]) if summary_row[0] else 0,
-                    "unique_dates": int(summary_row[10]) if summary_row[10] else 0,
+                    "total_records": int(stats["total_records"]) if stats.get("total_records") else 0,
+                    "unique_dates": int(stats["unique_dates"]) if stats.get("unique_dates") else 0,
                     "date_range": {
-                        "earliest": str(summary_row[5]) if summary_row[5] else None,
-                        "latest": str(summary_row[6]) if summary_row[6] else None
+                        "earliest": str(stats["earliest_date"]) if stats.get("earliest_date") else None,
+                        "latest": str(stats["latest_date"]) if stats.get("latest_date") else None
                     }
                 },
                 "geographic_extent": {
                     "latitude_range": {
-                        "min": float(summary_row[1]) if summary_row[1] else None,
-                        "max": float(summary_row[2]) if summary_row[2] else None
+                        "min": float(stats["min_latitude"]) if stats.get("min_latitude") else None,
+                        "max": float(stats["max_latitude"]) if stats.get("max_latitude") else None
                     },
                     "longitude_range": {
-                        "min": float(summary_row[3]) if summary_row[3] else None,
-                        "max": float(summary_row[4]) if summary_row[4] else None
+                        "min": float(stats["min_longitude"]) if stats.get("min_longitude") else None,
+                        "max": float(stats["max_longitude"]) if stats.get("max_longitude") else None
                     }
                 },
                 "mixed_layer_depth_stats": {
-                    "average": float(summary_row[7]) if summary_row[7] else None,
-                    "minimum": float(summary_row[8]) if summary_row[8] else None,
-                    "maximum": float(summary_row[9]) if summary_row[9] else None
+                    "average": float(stats["avg_mixed_layer_depth"]) if stats.get("avg_mixed_layer_depth") else None,
+                    "minimum": float(stats["min_mixed_layer_depth"]) if stats.get("min_mixed_layer_depth") else None,
+                    "maximum": float(stats["max_mixed_layer_depth"]) if stats.get("max_mixed_layer_depth") else None
                 },
-                "temporal_distribution": temporal_df.to_dict('records')
+                "temporal_distribution": temporal_records
             }
             
             metadata = {
@@ -466,40 +605,48 @@ class OceanDataQuery:
 
 
 # Convenience functions for direct use
-def get_sample_data(limit: int = 5, table_name: str = "argo_data") -> Dict:
+def _get_query_handler(table_name: str = "argo_data") -> OceanDataQuery:
+    """Get a cached OceanDataQuery instance for the given table"""
+    handler = _query_handlers.get(table_name)
+    if handler is None:
+        handler = _query_handlers[table_name] = OceanDataQuery(table_name)
+    return handler
+
+
+# One handler per table, shared by the convenience functions so repeated
+# calls skip reconnecting
+_query_handlers: Dict[str, OceanDataQuery] = {}
+
+
+def get_sample_data(limit: int = 5, table_name: str = "argo_data") -> QueryResult:
     """Convenience function to get sample data"""
-    query_handler = OceanDataQuery(table_name)
-    return query_handler.get_sample_data(limit)
+    return _get_query_handler(table_name).get_sample_data(limit)
 
 
-def get_data_count(table_name: str = "argo_data") -> Dict:
+def get_data_count(table_name: str = "argo_data") -> QueryResult:
     """Convenience function to get data count"""
-    query_handler = OceanDataQuery(table_name)
-    return query_handler.get_data_count()
+    return _get_query_handler(table_name).get_data_count()
 
 
-def query_by_location(lat_range: Tuple[float, float], 
-                     lon_range: Tuple[float, float], 
-                     limit: int = 100, 
-                     table_name: str = "argo_data") -> Dict:
+def query_by_location(lat_range: Tuple[float, float],
+                     lon_range: Tuple[float, float],
+                     limit: int = 100,
+                     table_name: str = "argo_data") -> QueryResult:
     """Convenience function to query by location"""
-    query_handler = OceanDataQuery(table_name)
-    return query_handler.query_by_location(lat_range, lon_range, limit)
+    return _get_query_handler(table_name).query_by_location(lat_range, lon_range, limit)
 
 
-def query_by_date_range(start_date: Union[str, date], 
-                       end_date: Union[str, date], 
-                       limit: int = 100, 
-                       table_name: str = "argo_data") -> Dict:
+def query_by_date_range(start_date: Union[str, date],
+                       end_date: Union[str, date],
+                       limit: int = 100,
+                       table_name: str = "argo_data") -> QueryResult:
     """Convenience function to query by date range"""
-    query_handler = OceanDataQuery(table_name)
-    return query_handler.query_by_date_range(start_date, end_date, limit)
+    return _get_query_handler(table_name).query_by_date_range(start_date, end_date, limit)
 
 
-def get_data_summary(table_name: str = "argo_data") -> Dict:
+def get_data_summary(table_name: str = "argo_data") -> QueryResult:
     """Convenience function to get data summary"""
-    query_handler = OceanDataQuery(table_name)
-    return query_handler.get_data_summary()
+    return _get_query_handler(table_name).get_data_summary()
 
 
 if __name__ == "__main__":
@@ -512,18 +659,18 @@ if __name__ == "__main__":
         # Test basic functions
         print("1. Testing get_sample_data()...")
         sample_result = get_sample_data(3)
-        print(f"   Success: {sample_result['success']}")
-        print(f"   Message: {sample_result['message']}")
+        print(f"   Success: {sample_result.success}")
+        print(f"   Message: {sample_result.message}")
         
         print("\n2. Testing get_data_count()...")
         count_result = get_data_count()
-        print(f"   Success: {count_result['success']}")
-        print(f"   Message: {count_result['message']}")
+        print(f"   Success: {count_result.success}")
+        print(f"   Message: {count_result.message}")
         
         print("\n3. Testing get_data_summary()...")
         summary_result = get_data_summary()
-        print(f"   Success: {summary_result['success']}")
-        print(f"   Message: {summary_result['message']}")
+        print(f"   Success: {summary_result.success}")
+        print(f"   Message: {summary_result.message}")
         
         # Example location query (Indian Ocean region)
         print("\n4. Testing query_by_location()...")
@@ -532,8 +679,8 @@ if __name__ == "__main__":
             lon_range=(60, 80),
             limit=5
         )
-        print(f"   Success: {location_result['success']}")
-        print(f"   Message: {location_result['message']}")
+        print(f"   Success: {location_result.success}")
+        print(f"   Message: {location_result.message}")
         
         # Example date range query
         print("\n5. Testing query_by_date_range()...")
@@ -542,8 +689,8 @@ if __name__ == "__main__":
             end_date="2019-01-30",
             limit=5
         )
-        print(f"   Success: {date_result['success']}")
-        print(f"   Message: {date_result['message']}")
+        print(f"   Success: {date_result.success}")
+        print(f"   Message: {date_result.message}")
         
         print("\n✅ All tests completed!")
         